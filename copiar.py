@@ -9,18 +9,30 @@ All operations are idempotent — re-running never creates duplicate commits.
 from __future__ import annotations
 
 import argparse
+import functools
 import os
 import shutil
 import subprocess
 import sys
 import tempfile
-from dataclasses import dataclass
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from datetime import UTC, date, datetime, timedelta
 from pathlib import Path
-from typing import Any, TypeAlias
+from typing import TYPE_CHECKING, Any, TypeAlias
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter, Retry
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+try:  # optional speedup: `uv sync --extra fast`
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
 
 # ---------------------------------------------------------------------------
 # Types
@@ -35,15 +47,64 @@ class GitIdentity:
     email: str
 
 
+@dataclass(frozen=True, slots=True)
+class RepoState:
+    exists: bool
+    head_sha: str | None
+    clone_url: str
+
+    @property
+    def has_commits(self) -> bool:
+        return self.head_sha is not None
+
+
 GITHUB_API = "https://api.github.com"
 GITHUB_GRAPHQL = "https://api.github.com/graphql"
+MAX_FETCH_WORKERS = 8
+CHUNKS_PER_QUERY = 10
+
+# One pooled session for every GitHub call: keep-alive reuses TCP+TLS
+# connections, and transient 5xx responses are retried with backoff.
+_SESSION = requests.Session()
+_SESSION.headers.update(
+    {
+        "Accept": "application/vnd.github+json",
+        "X-GitHub-Api-Version": "2022-11-28",
+    }
+)
+_RETRY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=[502, 503, 504],
+    raise_on_status=False,
+)
+# urllib3 never retries POST by default, which keeps repo creation safe
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=4, pool_maxsize=MAX_FETCH_WORKERS, max_retries=_RETRY),
+)
+# GraphQL queries are read-only, so their POSTs may be retried too
+_SESSION.mount(
+    GITHUB_GRAPHQL,
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=MAX_FETCH_WORKERS,
+        max_retries=_RETRY.new(allowed_methods=None),
+    ),
+)
+
+
+def _auth(token: str) -> dict[str, str]:
+    """Per-request Authorization header for the shared session."""
+    return {"Authorization": f"Bearer {token}"}
+
 
 # ---------------------------------------------------------------------------
 # Config
 # ---------------------------------------------------------------------------
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Config:
     personal_token: str
     work_username: str
@@ -68,15 +129,19 @@ def run_git(
     args: list[str],
     cwd: Path,
     env: dict[str, str] | None = None,
+    capture_stdout: bool = True,
 ) -> str:
-    """Run a git command; exit 1 with stderr on failure."""
-    full_env = os.environ.copy()
-    if env:
-        full_env.update(env)
+    """Run a git command; exit 1 with stderr on failure.
+
+    With `capture_stdout=False` stdout is discarded and "" is returned.
+    """
+    # env=None lets the child inherit os.environ without a Python-side copy
+    full_env = None if env is None else {**os.environ, **env}
     result = subprocess.run(
         ["git", *args],
         cwd=cwd,
-        capture_output=True,
+        stdout=subprocess.PIPE if capture_stdout else subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
         text=True,
         env=full_env,
         check=False,
@@ -84,67 +149,190 @@ def run_git(
     if result.returncode != 0:
         print(f"git {' '.join(args)} failed:\n{result.stderr}", file=sys.stderr)
         sys.exit(1)
-    return result.stdout
+    return result.stdout or ""
+
+
+def _quote_config_value(value: str) -> str:
+    """Quote a value for .git/config, escaping `\\`, `"` and newlines."""
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'"{escaped}"'
+
+
+def _git_dir(repo_dir: Path) -> Path:
+    """Locate the git dir, following a `gitdir:` file (worktree, submodule)."""
+    dot_git = repo_dir / ".git"
+    if dot_git.is_dir():
+        return dot_git
+    if dot_git.is_file():
+        content = dot_git.read_text(encoding="utf-8").strip()
+        if content.startswith("gitdir: "):
+            return (repo_dir / content.removeprefix("gitdir: ")).resolve()
+    # e.g. repo_dir is a subdirectory of a work tree
+    return Path(run_git(["rev-parse", "--absolute-git-dir"], cwd=repo_dir).strip())
 
 
 def configure_git(repo_dir: Path, name: str, email: str) -> None:
     """Set local git user.name and user.email (required in CI)."""
-    run_git(["config", "user.name", name], cwd=repo_dir)
-    run_git(["config", "user.email", email], cwd=repo_dir)
+    run_git(["config", "user.name", name], cwd=repo_dir, capture_stdout=False)
+    run_git(["config", "user.email", email], cwd=repo_dir, capture_stdout=False)
 
 
-def load_existing_commits(repo_dir: Path) -> ContributionMap:
-    """Single-pass git log → date count map."""
-    # If the repo has no commits yet, return empty map
+def _write_git_identity(repo_dir: Path, name: str, email: str) -> None:
+    """Append a [user] section to a freshly cloned or initialised repo.
+
+    The config was just generated by git and carries no identity, so the
+    section is written directly instead of spawning `git config` twice.
+    """
+    config_path = repo_dir / ".git" / "config"
+    text = config_path.read_text(encoding="utf-8")
+    if text and not text.endswith("\n"):
+        text += "\n"
+    config_path.write_text(
+        text
+        + "[user]\n"
+        + f"\tname = {_quote_config_value(name)}\n"
+        + f"\temail = {_quote_config_value(email)}\n",
+        encoding="utf-8",
+    )
+
+
+def _current_branch(repo_dir: Path) -> str:
+    """Read the checked-out branch from HEAD; `main` if HEAD is detached."""
+    head = (_git_dir(repo_dir) / "HEAD").read_text(encoding="utf-8").strip()
+    prefix = "ref: refs/heads/"
+    return head.removeprefix(prefix) if head.startswith(prefix) else "main"
+
+
+def _head_sha(repo_dir: Path) -> str | None:
+    """Return the SHA of HEAD, or None if the repo has no commits yet."""
     result = subprocess.run(
-        ["git", "rev-parse", "--verify", "HEAD"],
+        ["git", "rev-parse", "--verify", "--quiet", "HEAD"],
         cwd=repo_dir,
         capture_output=True,
         text=True,
         check=False,
     )
     if result.returncode != 0:
+        return None
+    return result.stdout.strip()
+
+
+def _stream_git_log_dates(repo_dir: Path) -> Iterator[str]:
+    """Yield each commit's YYYY-MM-DD author date as git log produces it."""
+    args = ["log", "--format=%ad", "--date=format:%Y-%m-%d"]
+    with subprocess.Popen(
+        ["git", *args],
+        cwd=repo_dir,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    ) as proc:
+        assert proc.stdout is not None
+        assert proc.stderr is not None
+        for line in proc.stdout:
+            day = line.rstrip()
+            if day:
+                yield day
+        stderr = proc.stderr.read()
+        returncode = proc.wait()
+    if returncode != 0:
+        print(f"git {' '.join(args)} failed:\n{stderr}", file=sys.stderr)
+        sys.exit(1)
+
+
+def load_existing_commits(repo_dir: Path) -> ContributionMap:
+    """Single-pass git log → date count map."""
+    # If the repo has no commits yet, return empty map
+    if _head_sha(repo_dir) is None:
         return {}
+    return dict(Counter(_stream_git_log_dates(repo_dir)))
+
+
+def _clean_ident_part(value: str) -> str:
+    """Drop `<`, `>` and newlines like git does, so fast-import accepts it."""
+    return value.translate(str.maketrans("", "", "<>\n")).strip()
+
+
+def create_all_commits(
+    repo_dir: Path,
+    needed: ContributionMap,
+    identity: GitIdentity,
+) -> None:
+    """Create all backdated empty commits (noon UTC) in one `git fast-import`.
+
+    Commits are written in `needed` iteration order, which callers keep
+    chronological (see fetch_contributions).
+    """
+    ref = f"refs/heads/{_current_branch(repo_dir)}"
+    parent = _head_sha(repo_dir)
+    name = _clean_ident_part(identity.name)
+    email = _clean_ident_part(identity.email)
+    ident = f"{name} <{email}>" if name else f"<{email}>"
+
+    commit_line = f"commit {ref}\n"
+    stream: list[str] = []
+    mark = 0
+    for day, count in needed.items():
+        noon = datetime.fromisoformat(f"{day}T12:00:00+00:00")
+        epoch = int(noon.timestamp())
+        # Everything but the mark and the 1-based index is fixed per day
+        signature = f"author {ident} {epoch} +0000\ncommitter {ident} {epoch} +0000\n"
+        msg_prefix = f"mirror: {day} ("
+        msg_suffix = f"/{count})\n"
+        for i in range(1, count + 1):
+            mark += 1
+            # ASCII-only, so the str length is also the byte length for `data`
+            msg = f"{msg_prefix}{i}{msg_suffix}"
+            if mark > 1:
+                from_line = f"from :{mark - 1}\n"
+            else:
+                from_line = f"from {parent}\n" if parent is not None else ""
+            stream.append(
+                f"{commit_line}mark :{mark}\n{signature}"
+                f"data {len(msg)}\n{msg}{from_line}\n"
+            )
 
-    output = run_git(
-        ["log", "--format=%ad", "--date=format:%Y-%m-%d"],
+    # Mirror objects are reproducible from the API, so skip fsync for the bulk
+    # write; any crash is recovered by simply re-running.
+    proc = subprocess.Popen(
+        [
+            "git",
+            "-c",
+            "core.fsync=none",
+            "fast-import",
+            "--date-format=raw",
+            "--quiet",
+        ],
         cwd=repo_dir,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
     )
-    counts: ContributionMap = {}
-    for line in output.splitlines():
-        day = line.strip()
-        if day:
-            counts[day] = counts.get(day, 0) + 1
-    return counts
-
-
-def create_commits_for_day(repo_dir: Path, day: str, count: int) -> None:
-    """Create `count` backdated empty commits for `day` at noon UTC."""
-    timestamp = f"{day}T12:00:00+00:00"
-    date_env = {
-        "GIT_AUTHOR_DATE": timestamp,
-        "GIT_COMMITTER_DATE": timestamp,
-    }
-    for i in range(count):
-        run_git(
-            [
-                "commit",
-                "--allow-empty",
-                "-m",
-                f"mirror: {day} ({i + 1}/{count})",
-            ],
-            cwd=repo_dir,
-            env=date_env,
+    _, stderr = proc.communicate("".join(stream).encode())
+    if proc.returncode != 0:
+        print(
+            f"git fast-import failed:\n{stderr.decode(errors='replace')}",
+            file=sys.stderr,
         )
+        sys.exit(1)
 
 
 def push_to_remote(repo_dir: Path) -> None:
-    """Detect current branch and push without force."""
-    branch = run_git(
-        ["rev-parse", "--abbrev-ref", "HEAD"],
+    """Push the current branch without force, setting upstream on first push."""
+    branch = _current_branch(repo_dir)
+    upstream = subprocess.run(
+        ["git", "config", "--get", f"branch.{branch}.remote"],
         cwd=repo_dir,
-    ).strip()
-    run_git(["push", "origin", branch], cwd=repo_dir)
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    # An explicit refspec skips the remote's wildcard ref lookup
+    refspec = f"refs/heads/{branch}:refs/heads/{branch}"
+    args = ["push", "--atomic", "origin", refspec]
+    if upstream.returncode != 0:
+        args.insert(1, "--set-upstream")
+    run_git(args, cwd=repo_dir, capture_stdout=False)
 
 
 # ---------------------------------------------------------------------------
@@ -154,16 +342,12 @@ def push_to_remote(repo_dir: Path) -> None:
 
 def delete_repo(username: str, token: str, repo_name: str) -> None:
     """Delete the GitHub repo via REST API. No-op if repo doesn't exist."""
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github+json",
-        "X-GitHub-Api-Version": "2022-11-28",
-    }
-    resp = requests.delete(
+    resp = _SESSION.delete(
         f"{GITHUB_API}/repos/{username}/{repo_name}",
-        headers=headers,
+        headers=_auth(token),
         timeout=30,
     )
+    get_repo_state.cache_clear()
     if resp.status_code == 404:
         return  # already gone
     if resp.status_code not in (200, 204):
@@ -174,89 +358,67 @@ def delete_repo(username: str, token: str, repo_name: str) -> None:
         sys.exit(1)
 
 
-def ensure_repo_exists(username: str, token: str, repo_name: str) -> tuple[str, bool]:
-    """Create repo if absent; return (HTTPS URL with token, repo_has_commits)."""
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github+json",
-        "X-GitHub-Api-Version": "2022-11-28",
-    }
+@functools.cache
+def get_repo_state(username: str, repo_name: str, token: str) -> RepoState:
+    """Inspect the mirror repo with a single REST call (cached per process).
 
-    # Check if it exists
-    resp = requests.get(
-        f"{GITHUB_API}/repos/{username}/{repo_name}",
-        headers=headers,
+    The commits endpoint answers every question at once: 404 means the repo
+    is missing, 409 means it is empty, otherwise the first entry is HEAD.
+    """
+    url = f"https://{token}@github.com/{username}/{repo_name}.git"
+    resp = _SESSION.get(
+        f"{GITHUB_API}/repos/{username}/{repo_name}/commits",
+        headers=_auth(token),
+        params={"per_page": 1},
         timeout=30,
     )
-
-    if resp.status_code == 200:
-        data = resp.json()
-        has_commits = (data.get("size", 0) > 0) or (
-            data.get("default_branch") is not None and data.get("pushed_at") is not None
-        )
-        url = f"https://{token}@github.com/{username}/{repo_name}.git"
-        return url, has_commits
-
     if resp.status_code == 404:
-        # Create it
-        create_resp = requests.post(
-            f"{GITHUB_API}/user/repos",
-            headers=headers,
-            json={
-                "name": repo_name,
-                "private": True,
-                "description": "GitHub contribution mirror",
-                "auto_init": False,
-            },
-            timeout=30,
+        return RepoState(exists=False, head_sha=None, clone_url=url)
+    if resp.status_code == 409:
+        return RepoState(exists=True, head_sha=None, clone_url=url)
+    if resp.status_code != 200:
+        print(
+            f"Error checking repo: {resp.status_code} {resp.text}",
+            file=sys.stderr,
         )
-        if create_resp.status_code == 422:
-            print(
-                f"Error: repo name conflict creating '{repo_name}'. Exit.",
-                file=sys.stderr,
-            )
-            sys.exit(1)
-        create_resp.raise_for_status()
-        url = f"https://{token}@github.com/{username}/{repo_name}.git"
-        return url, False
-
-    print(
-        f"Error checking repo: {resp.status_code} {resp.text}",
-        file=sys.stderr,
-    )
-    sys.exit(1)
-
-
-def _repo_has_remote_commits(username: str, repo_name: str, token: str) -> bool:
-    """Check if the remote repo has any commits via REST API."""
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github+json",
-        "X-GitHub-Api-Version": "2022-11-28",
-    }
-    resp = requests.get(
-        f"{GITHUB_API}/repos/{username}/{repo_name}/commits",
-        headers=headers,
-        params={"per_page": 1},
+        sys.exit(1)
+    commits = _json_loads(resp.content)
+    head_sha: str | None = commits[0]["sha"] if commits else None
+    return RepoState(exists=True, head_sha=head_sha, clone_url=url)
+
+
+def ensure_repo_exists(username: str, token: str, repo_name: str) -> RepoState:
+    """Create repo if absent; return its state."""
+    state = get_repo_state(username, repo_name, token)
+    if state.exists:
+        return state
+
+    # Create it
+    create_resp = _SESSION.post(
+        f"{GITHUB_API}/user/repos",
+        headers=_auth(token),
+        json={
+            "name": repo_name,
+            "private": True,
+            "description": "GitHub contribution mirror",
+            "auto_init": False,
+        },
         timeout=30,
     )
-    if resp.status_code == 409:
-        # Empty repo
-        return False
-    if resp.status_code == 404:
-        return False
-    resp.raise_for_status()
-    commits = resp.json()
-    return isinstance(commits, list) and len(commits) > 0
+    if create_resp.status_code == 422:
+        print(
+            f"Error: repo name conflict creating '{repo_name}'. Exit.",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+    create_resp.raise_for_status()
+    get_repo_state.cache_clear()
+    return replace(state, exists=True)
 
 
 def prepare_local_repo(
     local_dir: Path | None,
-    remote_url: str,
-    repo_has_commits: bool,
-    username: str,
-    repo_name: str,
-    token: str,
+    repo: RepoState,
     identity: GitIdentity,
 ) -> Path:
     """Clone if remote has history, else init fresh. Always configures git."""
@@ -273,36 +435,58 @@ def prepare_local_repo(
             check=False,
         )
         if check.returncode == 0:
-            # Already a git repo — pull latest
-            if repo_has_commits or _repo_has_remote_commits(username, repo_name, token):
-                run_git(["pull", "--rebase", "origin"], cwd=repo_dir)
+            # Already a git repo — pull latest unless HEAD already matches
+            if repo.has_commits and repo.head_sha != _head_sha(repo_dir):
+                run_git(
+                    ["pull", "--rebase", "origin"], cwd=repo_dir, capture_stdout=False
+                )
             configure_git(repo_dir, identity.name, identity.email)
             return repo_dir
         # Not yet a git repo in this dir
     else:
         repo_dir = Path(tempfile.mkdtemp(prefix="copiar-"))
 
-    actually_has_commits = repo_has_commits or _repo_has_remote_commits(
-        username, repo_name, token
-    )
-
-    if actually_has_commits:
+    if repo.has_commits:
         # Clone into the target directory
         subprocess.run(
-            ["git", "clone", remote_url, str(repo_dir)],
+            [
+                "git",
+                "clone",
+                "--single-branch",
+                "--no-tags",
+                repo.clone_url,
+                str(repo_dir),
+            ],
             check=True,
             capture_output=True,
             text=True,
         )
     else:
         # Init fresh repo
-        run_git(["init", "-b", "main"], cwd=repo_dir)
-        run_git(["remote", "add", "origin", remote_url], cwd=repo_dir)
+        run_git(["init", "-b", "main"], cwd=repo_dir, capture_stdout=False)
+        run_git(
+            ["remote", "add", "origin", repo.clone_url],
+            cwd=repo_dir,
+            capture_stdout=False,
+        )
 
-    configure_git(repo_dir, identity.name, identity.email)
+    _write_git_identity(repo_dir, identity.name, identity.email)
     return repo_dir
 
 
+def remove_repo_dir(repo_dir: Path) -> None:
+    """Best-effort delete of a local repo; `rm -rf` on POSIX, else rmtree."""
+    if os.name == "posix":
+        try:
+            result = subprocess.run(["rm", "-rf", str(repo_dir)], check=False)
+        except OSError:
+            pass
+        else:
+            if result.returncode == 0:
+                return
+    shutil.rmtree(repo_dir, ignore_errors=True)
+
+
 # ---------------------------------------------------------------------------
 # GitHub API helpers
 # ---------------------------------------------------------------------------
@@ -310,13 +494,10 @@ def prepare_local_repo(
 
 def _graphql(query: str, variables: dict[str, Any], token: str) -> dict[str, Any]:
     """Execute a GraphQL query; exit 1 on auth failure."""
-    resp = requests.post(
+    resp = _SESSION.post(
         GITHUB_GRAPHQL,
         json={"query": query, "variables": variables},
-        headers={
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-        },
+        headers=_auth(token),
         timeout=30,
     )
     if resp.status_code == 401:
@@ -327,7 +508,7 @@ def _graphql(query: str, variables: dict[str, Any], token: str) -> dict[str, Any
         )
         sys.exit(1)
     resp.raise_for_status()
-    data = resp.json()
+    data = _json_loads(resp.content)
     if "errors" in data:
         print(f"GraphQL errors: {data['errors']}", file=sys.stderr)
         sys.exit(1)
@@ -358,12 +539,7 @@ def fetch_user_created_at(username: str, token: str) -> date:
 
 def fetch_personal_user_info(token: str) -> GitIdentity:
     """Fetch the personal account's display name and noreply email."""
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github+json",
-        "X-GitHub-Api-Version": "2022-11-28",
-    }
-    resp = requests.get(f"{GITHUB_API}/user", headers=headers, timeout=30)
+    resp = _SESSION.get(f"{GITHUB_API}/user", headers=_auth(token), timeout=30)
     if resp.status_code == 401:
         print(
             "Error: personal token returned 401. Check PERSONAL_GITHUB_TOKEN scopes.",
@@ -371,7 +547,7 @@ def fetch_personal_user_info(token: str) -> GitIdentity:
         )
         sys.exit(1)
     resp.raise_for_status()
-    data = resp.json()
+    data = _json_loads(resp.content)
     user_id: int = data["id"]
     login: str = data["login"]
     name: str = data.get("name") or login
@@ -379,34 +555,49 @@ def fetch_personal_user_info(token: str) -> GitIdentity:
     return GitIdentity(name=name, email=email)
 
 
-def _fetch_contributions_chunk(
-    username: str,
-    token: str,
-    start: date,
-    end: date,
-) -> ContributionMap:
-    """Fetch contributions for a single ≤365-day chunk."""
-    query = """
-    query($login: String!, $from: DateTime!, $to: DateTime!) {
-      user(login: $login) {
-        contributionsCollection(from: $from, to: $to) {
-          contributionCalendar {
+_CALENDAR_DAYS = """
             weeks {
               contributionDays {
                 date
                 contributionCount
               }
-            }
-          }
-        }
-      }
-    }
+            }"""
+_CALENDAR_TOTAL = """
+            totalContributions"""
+
+
+def _fetch_calendars_batch(
+    username: str,
+    token: str,
+    chunks: list[tuple[date, date]],
+    detailed: bool,
+) -> list[dict[str, Any]]:
+    """Fetch the calendars of several ≤365-day chunks in one aliased query.
+
+    `detailed` selects the per-day matrix; otherwise only the total is fetched.
     """
-    variables: dict[str, Any] = {
-        "login": username,
-        "from": f"{start.isoformat()}T00:00:00Z",
-        "to": f"{end.isoformat()}T23:59:59Z",
-    }
+    selection = _CALENDAR_DAYS if detailed else _CALENDAR_TOTAL
+    params = ", ".join(
+        f"$from{i}: DateTime!, $to{i}: DateTime!" for i in range(len(chunks))
+    )
+    collections = "\n".join(
+        f"""
+        c{i}: contributionsCollection(from: $from{i}, to: $to{i}) {{
+          contributionCalendar {{{selection}
+          }}
+        }}"""
+        for i in range(len(chunks))
+    )
+    query = f"""
+    query($login: String!, {params}) {{
+      user(login: $login) {{{collections}
+      }}
+    }}
+    """
+    variables: dict[str, Any] = {"login": username}
+    for i, (start, end) in enumerate(chunks):
+        variables[f"from{i}"] = f"{start.isoformat()}T00:00:00Z"
+        variables[f"to{i}"] = f"{end.isoformat()}T23:59:59Z"
     data = _graphql(query, variables, token)
     user = data.get("user")
     if user is None:
@@ -415,31 +606,75 @@ def _fetch_contributions_chunk(
             file=sys.stderr,
         )
         sys.exit(1)
-    calendar = user["contributionsCollection"]["contributionCalendar"]
-    result: ContributionMap = {}
-    for week in calendar["weeks"]:
-        for day_data in week["contributionDays"]:
-            count: int = day_data["contributionCount"]
-            if count > 0:
-                result[day_data["date"]] = count
-    return result
+    return [user[f"c{i}"]["contributionCalendar"] for i in range(len(chunks))]
 
 
-def fetch_contributions(
-    work_username: str,
+def _fetch_calendars(
+    username: str,
     token: str,
     start: date,
     end: date,
-) -> ContributionMap:
-    """Fetch contributions, splitting into ≤365-day chunks."""
-    merged: ContributionMap = {}
+    detailed: bool,
+) -> list[dict[str, Any]]:
+    """Fetch calendars in ≤365-day chunks, batched and fetched concurrently."""
+    chunks: list[tuple[date, date]] = []
     chunk_start = start
     while chunk_start <= end:
         chunk_end = min(end, chunk_start + timedelta(days=364))
-        chunk = _fetch_contributions_chunk(work_username, token, chunk_start, chunk_end)
-        merged.update(chunk)
+        chunks.append((chunk_start, chunk_end))
         chunk_start = chunk_end + timedelta(days=1)
-    return merged
+    if not chunks:
+        return []
+
+    batches = [
+        chunks[i : i + CHUNKS_PER_QUERY]
+        for i in range(0, len(chunks), CHUNKS_PER_QUERY)
+    ]
+    if len(batches) == 1:
+        return _fetch_calendars_batch(username, token, batches[0], detailed)
+
+    calendars: list[dict[str, Any]] = []
+    with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(batches))) as pool:
+        futures = [
+            pool.submit(_fetch_calendars_batch, username, token, batch, detailed)
+            for batch in batches
+        ]
+        # Collect in submission order so calendars stay chronological
+        for future in futures:
+            calendars.extend(future.result())
+    return calendars
+
+
+def fetch_contributions(
+    work_username: str,
+    token: str,
+    start: date,
+    end: date,
+) -> ContributionMap:
+    """Fetch per-day contribution counts (non-zero days only), oldest first.
+
+    Calendars come back chronologically and weeks within them are ordered,
+    so the map's insertion order is already sorted by day.
+    """
+    result: ContributionMap = {}
+    for calendar in _fetch_calendars(work_username, token, start, end, detailed=True):
+        for week in calendar["weeks"]:
+            for day_data in week["contributionDays"]:
+                count: int = day_data["contributionCount"]
+                if count > 0:
+                    result[day_data["date"]] = count
+    return result
+
+
+def fetch_contribution_total(
+    work_username: str,
+    token: str,
+    start: date,
+    end: date,
+) -> int:
+    """Fetch only the total contribution count (no per-day matrix)."""
+    calendars = _fetch_calendars(work_username, token, start, end, detailed=False)
+    return sum(calendar["totalContributions"] for calendar in calendars)
 
 
 # ---------------------------------------------------------------------------
@@ -471,7 +706,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--dry-run",
         action="store_true",
-        help="Fetch + print delta, no git ops",
+        help="Fetch + print target commit total, no git ops",
     )
     parser.add_argument(
         "--yes",
@@ -571,7 +806,7 @@ def load_config(args: argparse.Namespace) -> Config:
 # ---------------------------------------------------------------------------
 
 
-def main() -> None:  # noqa: C901, PLR0912, PLR0915
+def main() -> None:  # noqa: C901, PLR0911, PLR0912, PLR0915
     """Entry point."""
     args = parse_args()
     config = load_config(args)
@@ -582,22 +817,39 @@ def main() -> None:  # noqa: C901, PLR0912, PLR0915
         account_start = fetch_user_created_at(
             config.work_username, config.personal_token
         )
-        config = Config(
-            personal_token=config.personal_token,
-            work_username=config.work_username,
-            personal_username=config.personal_username,
-            target_repo=config.target_repo,
-            start_date=account_start,
-            end_date=config.end_date,
-            local_dir=config.local_dir,
-            dry_run=config.dry_run,
-            yes=config.yes,
-            keep_repo=config.keep_repo,
-            backfill=config.backfill,
-            reset_repo=config.reset_repo,
-        )
+        config = replace(config, start_date=account_start)
         print(f"Backfill start: {config.start_date}")
 
+    if config.start_date > config.end_date:
+        print(
+            f"Error: start date {config.start_date} is after end date "
+            f"{config.end_date}.",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+    if config.dry_run:
+        # In dry run we can't compute existing without cloning — show the
+        # target total, which needs only the lightweight totals query
+        print(
+            f"Fetching contribution total for '{config.work_username}' "
+            f"from {config.start_date} to {config.end_date}..."
+        )
+        total_target = fetch_contribution_total(
+            config.work_username,
+            config.personal_token,
+            config.start_date,
+            config.end_date,
+        )
+        if total_target == 0:
+            print("No contributions found in the specified date range.")
+            return
+        print(
+            f"\n[dry-run] Would create up to {total_target} commits "
+            f"between {config.start_date} and {config.end_date}."
+        )
+        return
+
     print(
         f"Fetching contributions for '{config.work_username}' "
         f"from {config.start_date} to {config.end_date}..."
@@ -618,17 +870,6 @@ def main() -> None:  # noqa: C901, PLR0912, PLR0915
         f"Found {len(contributions)} active days ({total_target} total contributions)."
     )
 
-    if config.dry_run:
-        # In dry run we can't compute existing without cloning — show full target
-        print("\n[dry-run] Contribution delta (target counts):")
-        for day in sorted(contributions):
-            print(f"  {day}: {contributions[day]}")
-        print(
-            f"\n[dry-run] Would create up to {total_target} commits "
-            f"across {len(contributions)} days."
-        )
-        return
-
     # --reset-repo: delete GitHub repo + local clone, then recreate fresh
     if config.reset_repo:
         print(
@@ -646,17 +887,21 @@ def main() -> None:  # noqa: C901, PLR0912, PLR0915
             shutil.rmtree(config.local_dir)
             print(f"Deleted local clone at '{config.local_dir}'.")
 
-    # Fetch personal user identity for git authorship
-    identity = fetch_personal_user_info(config.personal_token)
-    print(f"Commit author: {identity.name} <{identity.email}>")
+    # Fetch personal user identity for git authorship while the mirror repo
+    # is checked (and created if missing)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        identity_future = pool.submit(fetch_personal_user_info, config.personal_token)
 
-    # Ensure mirror repo exists
-    print(f"Checking mirror repo '{config.target_repo}'...")
-    remote_url, repo_has_commits = ensure_repo_exists(
-        config.personal_username,
-        config.personal_token,
-        config.target_repo,
-    )
+        # Ensure mirror repo exists
+        print(f"Checking mirror repo '{config.target_repo}'...")
+        repo = ensure_repo_exists(
+            config.personal_username,
+            config.personal_token,
+            config.target_repo,
+        )
+
+        identity = identity_future.result()
+    print(f"Commit author: {identity.name} <{identity.email}>")
 
     # Prepare local repo (clone or init)
     repo_dir: Path | None = None
@@ -664,11 +909,7 @@ def main() -> None:  # noqa: C901, PLR0912, PLR0915
     try:
         repo_dir = prepare_local_repo(
             config.local_dir,
-            remote_url,
-            repo_has_commits,
-            config.personal_username,
-            config.target_repo,
-            config.personal_token,
+            repo,
             identity,
         )
         if config.local_dir is None:
@@ -677,9 +918,9 @@ def main() -> None:  # noqa: C901, PLR0912, PLR0915
         # Load existing commits → compute delta
         existing = load_existing_commits(repo_dir)
         needed: ContributionMap = {
-            day: target - existing.get(day, 0)
+            day: delta
             for day, target in contributions.items()
-            if target - existing.get(day, 0) > 0
+            if (delta := target - existing.get(day, 0)) > 0
         }
 
         if not needed:
@@ -701,11 +942,10 @@ def main() -> None:  # noqa: C901, PLR0912, PLR0915
                 return
 
         # Create commits
-        for day in sorted(needed):
-            count = needed[day]
-            print(f"  {day}: +{count} commits", end="", flush=True)
-            create_commits_for_day(repo_dir, day, count)
-            print(" ✓")
+        for day, count in needed.items():
+            print(f"  {day}: +{count} commits")
+        create_all_commits(repo_dir, needed, identity)
+        print("Commits created ✓")
 
         # Push
         print("Pushing to remote...")
@@ -719,7 +959,7 @@ def main() -> None:  # noqa: C901, PLR0912, PLR0915
         print("\nInterrupted.")
     finally:
         if temp_dir is not None and not config.keep_repo:
-            shutil.rmtree(temp_dir, ignore_errors=True)
+            remove_repo_dir(temp_dir)
         elif repo_dir is not None and config.local_dir is None and config.keep_repo:
             print(f"Kept repo at: {repo_dir}")
 